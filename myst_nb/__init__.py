@@ -21,7 +21,7 @@ from sphinx.util import import_object, logging
 from sphinx.util.docutils import ReferenceRole, SphinxDirective
 
 from .exec_table import setup_exec_table
-from .execution import update_execution_cache
+from .execution import compile_exclude_patterns, update_execution_cache
 from .nb_glue import glue  # noqa: F401
 from .nb_glue.domain import (
     NbGlueDomain,
@@ -125,7 +125,11 @@ def setup(app: Sphinx):
     # show traceback in stdout (in addition to writing to file)
     # this is useful in e.g. RTD where one cannot inspect a file
     app.add_config_value("execution_show_tb", False, "")
+    # number of processes to execute notebooks across, in `auto` / `force` mode
+    app.add_config_value("execution_workers", 1, "env")
     app.add_config_value("nb_custom_formats", {}, "env")
+    # validate `.ipynb` files against the nbformat schema, when reading them
+    app.add_config_value("nb_validate_notebooks", True, "env")
 
     # render config
     app.add_config_value("nb_render_key", "render", "env")
@@ -152,6 +156,7 @@ def setup(app: Sphinx):
     app.connect("config-inited", add_exclude_patterns)
     app.connect("config-inited", update_togglebutton_classes)
     app.connect("env-updated", save_glue_cache)
+    app.connect("env-updated", clear_parallel_execution_data)
     app.connect("config-inited", add_nb_custom_formats)
     app.connect("env-updated", load_ipywidgets_js)
 
@@ -236,21 +241,30 @@ def validate_config_values(app: Sphinx, config):
                 f"`nb_custom_formats.{name}.commonmark_only` arg is not boolean"
             )
 
-        if not isinstance(app.config["nb_render_key"], str):
-            raise MystNbConfigError("`nb_render_key` is not a string")
-
-        if app.config["nb_output_stderr"] not in [
-            "show",
-            "remove",
-            "remove-warn",
-            "warn",
-            "error",
-            "severe",
-        ]:
-            raise MystNbConfigError(
-                "`nb_output_stderr` not one of: "
-                "'show', 'remove', 'remove-warn', 'warn', 'error', 'severe'"
-            )
+    if not (
+        isinstance(app.config["execution_workers"], int)
+        and app.config["execution_workers"] >= 1
+    ):
+        raise MystNbConfigError("`execution_workers` is not a positive integer")
+
+    if not isinstance(app.config["nb_validate_notebooks"], bool):
+        raise MystNbConfigError("`nb_validate_notebooks` is not a boolean")
+
+    if not isinstance(app.config["nb_render_key"], str):
+        raise MystNbConfigError("`nb_render_key` is not a string")
+
+    if app.config["nb_output_stderr"] not in [
+        "show",
+        "remove",
+        "remove-warn",
+        "warn",
+        "error",
+        "severe",
+    ]:
+        raise MystNbConfigError(
+            "`nb_output_stderr` not one of: "
+            "'show', 'remove', 'remove-warn', 'warn', 'error', 'severe'"
+        )
 
     # try loading notebook output renderer
     load_renderer(app.config["nb_render_plugin"])
@@ -324,17 +338,23 @@ def set_valid_execution_paths(app: Sphinx):
 
     Patterns given in execution_excludepatterns conf variable from executing.
     """
-    app.env.nb_excluded_exec_paths = {
-        str(path)
-        for pat in app.config["execution_excludepatterns"]
-        for path in Path().cwd().rglob(pat)
-    }
-    LOGGER.verbose("MyST-NB: Excluded Paths: %s", app.env.nb_excluded_exec_paths)
+    # patterns are globbed relative to the current working directory
+    app.env.nb_excluded_exec_root = os.getcwd()
+    app.env.nb_excluded_exec_regex = compile_exclude_patterns(
+        app.config["execution_excludepatterns"]
+    )
+    LOGGER.verbose(
+        "MyST-NB: Excluded Patterns: %s", app.config["execution_excludepatterns"]
+    )
     app.env.nb_allowed_exec_suffixes = {
         suffix
         for suffix, parser_type in app.config["source_suffix"].items()
         if parser_type in ("myst-nb",)
     }
+    # custom format suffixes are checked longest first, to get the "closest" match
+    app.env.nb_custom_formats_suffixes = tuple(
+        sorted(app.config["nb_custom_formats"], key=len, reverse=True)
+    )
     app.env.nb_contains_widgets = False
 
 
@@ -344,6 +364,15 @@ def set_up_execution_data(app: Sphinx):
     if not hasattr(app.env, "nb_execution_data_changed"):
         app.env.nb_execution_data_changed = False
     app.env.nb_execution_data_changed = False
+    # outputs of notebooks executed in a process pool, consumed when they are read
+    app.env.nb_executed_parallel = {}
+
+
+def clear_parallel_execution_data(app: Sphinx, env: BuildEnvironment):
+    """Drop any parallel execution outputs that were not consumed by a read,
+    so that they are not pickled with the environment.
+    """
+    env.nb_executed_parallel = {}
 
 
 def remove_execution_data(app: Sphinx, env, docname):
@@ -1,10 +1,13 @@
+import functools
 import json
+import re
 from pathlib import Path
-from typing import Callable, Iterable, Optional
+from typing import Callable, Dict, Iterable, Optional, Tuple
 
 import attr
 import nbformat as nbf
 import yaml
+from markdown_it import MarkdownIt
 from myst_parser.main import MdParserConfig
 from sphinx.environment import BuildEnvironment
 from sphinx.util import import_object, logging
@@ -15,8 +18,16 @@ RAW_DIRECTIVE = "{raw-cell}"
 
 LOGGER = logging.getLogger(__name__)
 
+# the line endings that markdown-it normalises to "\n" before parsing
+_NEWLINES_RE = re.compile(r"\r\n?")
+# the block token types that can start a new cell
+_CELL_BOUNDARY_TYPES = frozenset(("fence", "myst_block_break"))
 
-@attr.s
+# use the libyaml bindings, when PyYAML has been compiled against them
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@attr.s(slots=True)
 class NbConverter:
     func: Callable[[str], nbf.NotebookNode] = attr.ib()
     config: MdParserConfig = attr.ib()
@@ -31,14 +42,15 @@ def get_nb_converter(
 
     # Standard notebooks take priority
     if path.endswith(".ipynb"):
+        if not env.config.nb_validate_notebooks:
+            return NbConverter(read_ipynb_unvalidated, env.myst_config)
         return NbConverter(
             lambda text: nbf.reads(text, as_version=NOTEBOOK_VERSION), env.myst_config
         )
 
     # we check suffixes ordered by longest first, to ensure we get the "closest" match
-    for source_suffix in sorted(
-        env.config.nb_custom_formats.keys(), key=len, reverse=True
-    ):
+    # (the order is computed once, at builder-inited)
+    for source_suffix in env.nb_custom_formats_suffixes:
         if path.endswith(source_suffix):
             (
                 converter,
@@ -85,6 +97,20 @@ def get_nb_converter(
     return None
 
 
+def read_ipynb_unvalidated(text: str) -> nbf.NotebookNode:
+    """Read a notebook, without validating it against the nbformat JSON schema.
+
+    Notebooks of other major versions are converted by ``nbformat.reads``,
+    which also validates them.
+    """
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError(f"Notebook JSON must be an object, not: {type(data).__name__}")
+    if data.get("nbformat") != NOTEBOOK_VERSION:
+        return nbf.reads(text, as_version=NOTEBOOK_VERSION)
+    return nbf.v4.to_notebook_json(data)
+
+
 def is_myst_notebook(line_iter: Iterable[str]) -> bool:
     """Is the text file a MyST based notebook representation?"""
     # we need to distinguish between markdown representing notebooks
@@ -99,8 +125,13 @@ def is_myst_notebook(line_iter: Iterable[str]) -> bool:
             break
         yaml_lines.append(line.rstrip() + "\n")
 
+    yaml_text = "".join(yaml_lines)
+    # the format_name must be "myst", so only parse front matter that contains it
+    if "myst" not in yaml_text:
+        return False
+
     try:
-        front_matter = yaml.safe_load("".join(yaml_lines))
+        front_matter = yaml.load(yaml_text, Loader=_YamlLoader)
     except Exception:
         return False
     if front_matter is None:  # this can occur for empty files
@@ -134,10 +165,7 @@ class LoadFileParsingError(Exception):
 
 
 def strip_blank_lines(text):
-    text = text.rstrip()
-    while text and text.startswith("\n"):
-        text = text[1:]
-    return text
+    return text.rstrip().lstrip("\n")
 
 
 class MockDirective:
@@ -200,12 +228,40 @@ def load_code_from_file(nb_path, file_name, token, body_lines):
         )
         LOGGER.warning(msg)
     try:
-        body_lines = file_path.read_text().split("\n")
+        body_lines = list(_read_load_file(str(file_path), file_path.stat().st_mtime_ns))
     except Exception:
         raise LoadFileParsingError("Can't read file from :load: {}".format(file_path))
     return body_lines
 
 
+@functools.lru_cache(maxsize=128)
+def _read_load_file(path: str, mtime_ns: int) -> Tuple[str, ...]:
+    """Read the lines of a :load: file, cached until the file is modified."""
+    return tuple(Path(path).read_text().split("\n"))
+
+
+_BLOCK_PARSERS: Dict[str, MarkdownIt] = {}
+
+
+def _get_block_parser(config: MdParserConfig) -> MarkdownIt:
+    """Return a parser which runs only up to the block level rules.
+
+    Parsers are cached per configuration, since the same configuration
+    is used for every notebook in a project, and parsing does not mutate them.
+    """
+    from myst_parser.main import default_parser
+
+    # key on the original configuration, so that the (validated) evolved copy
+    # only needs to be created when the parser is first made
+    key = repr(attr.astuple(config))
+    if key not in _BLOCK_PARSERS:
+        inline_config = attr.evolve(
+            config, renderer="html", disable_syntax=(config.disable_syntax + ["inline"])
+        )
+        _BLOCK_PARSERS[key] = default_parser(inline_config)
+    return _BLOCK_PARSERS[key]
+
+
 def myst_to_notebook(
     text,
     config: MdParserConfig,
@@ -229,15 +285,20 @@ def myst_to_notebook(
     i.e. not nested in other directives.
     """
     # TODO warn about nested code-cells
-    from myst_parser.main import default_parser
 
     # parse markdown file up to the block level (i.e. don't worry about inline text)
-    inline_config = attr.evolve(
-        config, renderer="html", disable_syntax=(config.disable_syntax + ["inline"])
-    )
-    parser = default_parser(inline_config)
+    parser = _get_block_parser(config)
+    # line numbers in token maps count "\n" separated lines of the normalised text,
+    # so we record where each of those lines starts, to slice sources from the text
+    if "\r" in text:
+        text = _NEWLINES_RE.sub("\n", text)
     tokens = parser.parse(text + "\n")
-    lines = text.splitlines()
+    line_offsets = [0] + [match.end() for match in re.finditer("\n", text)]
+    line_offsets.append(len(text))
+
+    def _line_offset(line: int) -> int:
+        return line_offsets[min(line, len(line_offsets) - 1)]
+
     md_start_line = 0
 
     # get the document metadata
@@ -246,7 +307,7 @@ def myst_to_notebook(
         metadata = tokens.pop(0)
         md_start_line = metadata.map[1]
         try:
-            metadata_nb = yaml.safe_load(metadata.content)
+            metadata_nb = yaml.load(metadata.content, Loader=_YamlLoader)
         except (yaml.parser.ParserError, yaml.scanner.ScannerError) as error:
             raise MystMetadataParsingError("Notebook metadata: {}".format(error))
 
@@ -258,25 +319,23 @@ def myst_to_notebook(
 
     def _flush_markdown(start_line, token, md_metadata):
         """When we find a cell we check if there is preceding text.o"""
-        endline = token.map[0] if token else len(lines)
-        md_source = strip_blank_lines("\n".join(lines[start_line:endline]))
-        meta = nbf.from_dict(md_metadata)
+        end = _line_offset(token.map[0]) if token else len(text)
+        md_source = strip_blank_lines(text[_line_offset(start_line) : end])
         if md_source:
             source_map.append(start_line)
             notebook.cells.append(
-                nbf_version.new_markdown_cell(source=md_source, metadata=meta)
+                nbf_version.new_markdown_cell(source=md_source, metadata=md_metadata)
             )
 
     # iterate through the tokens to identify notebook cells
-    nesting_level = 0
+    # (note the new_*_cell functions convert the metadata dicts to NotebookNodes)
     md_metadata = {}
 
     for token in tokens:
 
-        nesting_level += token.nesting
-
-        if nesting_level != 0:
-            # we ignore fenced block that are nested, e.g. as part of lists, etc
+        # only top-level fences and block breaks can delimit cells
+        # (we ignore fenced block that are nested, e.g. as part of lists, etc)
+        if token.level != 0 or token.type not in _CELL_BOUNDARY_TYPES:
             continue
 
         if token.type == "fence" and token.info.startswith(code_directive):
@@ -287,10 +346,11 @@ def myst_to_notebook(
                 body_lines = load_code_from_file(
                     path, options["load"], token, body_lines
                 )
-            meta = nbf.from_dict(options)
             source_map.append(token.map[0] + 1)
             notebook.cells.append(
-                nbf_version.new_code_cell(source="\n".join(body_lines), metadata=meta)
+                nbf_version.new_code_cell(
+                    source="\n".join(body_lines), metadata=options
+                )
             )
             md_metadata = {}
             md_start_line = token.map[1]
@@ -298,10 +358,9 @@ def myst_to_notebook(
         elif token.type == "fence" and token.info.startswith(raw_directive):
             _flush_markdown(md_start_line, token, md_metadata)
             options, body_lines = read_fenced_cell(token, len(notebook.cells), "Raw")
-            meta = nbf.from_dict(options)
             source_map.append(token.map[0] + 1)
             notebook.cells.append(
-                nbf_version.new_raw_cell(source="\n".join(body_lines), metadata=meta)
+                nbf_version.new_raw_cell(source="\n".join(body_lines), metadata=options)
             )
             md_metadata = {}
             md_start_line = token.map[1]
@@ -9,12 +9,16 @@ The primary methods in this module are:
   or if 'auto' / 'force' is set, will execute the notebook.
 
 """
+import functools
 import os
 import re
 import tempfile
-from datetime import datetime
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from io import StringIO
 from pathlib import Path
-from typing import Iterable, List, Optional, Set
+from typing import Dict, Iterable, List, NamedTuple, Optional, Pattern, Set
 
 import nbformat as nbf
 from jupyter_cache import get_cache
@@ -30,6 +34,17 @@ from .converter import get_nb_converter
 LOGGER = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=8)
+def _get_cache(path: str):
+    """Return the (memoized) jupyter-cache instance for a cache folder.
+
+    The same cache path is queried for every notebook in a build,
+    so we re-use the instance (and its SQLite engine) rather than re-initialising it.
+    Use ``_get_cache.cache_clear()`` to reset (e.g. in tests).
+    """
+    return get_cache(path)
+
+
 def update_execution_cache(
     app: Sphinx, builder: Builder, added: Set[str], changed: Set[str], removed: Set[str]
 ):
@@ -57,7 +72,9 @@ def update_execution_cache(
             or Path(app.outdir).parent.joinpath(".jupyter_cache")
         )
 
-        cache_base = get_cache(app.env.nb_path_to_cache)
+        cache_base = _get_cache(app.env.nb_path_to_cache)
+        # query the staged notebooks once, rather than issuing a discard per path
+        staged = _get_staged_pks(cache_base) if removed else {}
         for path in removed:
 
             if path in app.env.nb_execution_data:
@@ -70,8 +87,9 @@ def update_execution_cache(
             # therefore, to be safe here, we run through all possible suffixes
             for suffix in app.env.nb_allowed_exec_suffixes:
                 docpath = os.path.splitext(docpath)[0] + suffix
-                if not os.path.exists(docpath):
-                    cache_base.discard_staged_notebook(docpath)
+                pk = staged.get(str(Path(docpath).absolute()))
+                if pk is not None and not os.path.exists(docpath):
+                    cache_base.discard_staged_notebook(pk)
 
         _stage_and_execute(
             env=app.env,
@@ -82,6 +100,13 @@ def update_execution_cache(
             exec_in_temp=app.config["execution_in_temp"],
         )
 
+    elif (
+        app.config["jupyter_execute_notebooks"] in ("auto", "force")
+        and app.config["execution_workers"] > 1
+        and len(exec_docnames) > 1
+    ):
+        _execute_parallel(app.env, exec_docnames, app.config["execution_workers"])
+
     return []
 
 
@@ -98,54 +123,40 @@ def generate_notebook_outputs(
     and merge it with the original notebook. If there is no cached output,
     checks if there was error during execution, then saves the traceback to a log file.
     """
+    execution_method = env.config["jupyter_execute_notebooks"]  # type: str
+
+    # nothing to do, so skip all path checks
+    if execution_method == "off":
+        return ntbk
 
     # check if the file is of a format that may be associated with outputs
     if not is_valid_exec_file(env, env.docname):
         return ntbk
 
-    # If we have a jupyter_cache, see if there's a cache for this notebook
     file_path = file_path or env.doc2path(env.docname)
 
-    execution_method = env.config["jupyter_execute_notebooks"]  # type: str
-
-    path_to_cache = env.nb_path_to_cache if "cache" in execution_method else None
+    # 'auto' (the default) and 'force' execute directly,
+    # otherwise we have a jupyter_cache, see if there's a cache for this notebook
+    if execution_method != "cache":
 
-    if not path_to_cache and "off" in execution_method:
-        return ntbk
-
-    if not path_to_cache:
-
-        if execution_method == "auto" and nb_has_all_output(file_path):
+        if execution_method == "auto" and nb_has_all_output(file_path, ntbk=ntbk):
             LOGGER.info(
                 "Did not execute %s. "
                 "Set jupyter_execute_notebooks to `force` to execute",
                 env.docname,
             )
         else:
-            if env.config["execution_in_temp"]:
-                with tempfile.TemporaryDirectory() as tmpdirname:
-                    LOGGER.info("Executing: %s in temporary directory", env.docname)
-                    result = single_nb_execution(
-                        ntbk,
-                        cwd=tmpdirname,
-                        timeout=env.config["execution_timeout"],
-                        allow_errors=env.config["execution_allow_errors"],
-                    )
-            else:
-                cwd = Path(file_path).parent
-                LOGGER.info("Executing: %s in: %s", env.docname, cwd)
-                result = single_nb_execution(
-                    ntbk,
-                    cwd=cwd,
-                    timeout=env.config["execution_timeout"],
-                    allow_errors=env.config["execution_allow_errors"],
-                )
+            # use the outputs from a parallel execution, if available
+            result = env.nb_executed_parallel.pop(env.docname, None)
+            if result is None:
+                result = _execute_direct(env, ntbk, file_path)
 
+            succeeded = result.err is None
             report_path = None
-            if result.err:
+            if not succeeded:
                 report_path, message = _report_exec_fail(
                     env,
-                    Path(file_path).name,
+                    os.path.basename(file_path),
                     result.exc_string,
                     show_traceback,
                     "Execution Failed with traceback saved in {}",
@@ -154,21 +165,16 @@ def generate_notebook_outputs(
 
             ntbk = result.nb
 
-            env.nb_execution_data_changed = True
-            env.nb_execution_data[env.docname] = {
-                "mtime": datetime.now().timestamp(),
-                "runtime": result.time,
-                "method": execution_method,
-                "succeeded": False if result.err else True,
-            }
-            if report_path:
-                env.nb_execution_data[env.docname]["error_log"] = report_path
+            _set_execution_data(
+                env, execution_method, result.time, succeeded, report_path
+            )
 
         return ntbk
 
-    cache_base = get_cache(path_to_cache)
+    cache_base = _get_cache(env.nb_path_to_cache)
     # Use relpath here in case Sphinx is building from a non-parent folder
-    r_file_path = Path(os.path.relpath(file_path, Path().resolve()))
+    # (relpath already makes both paths absolute, relative to the current directory)
+    r_file_path = os.path.relpath(file_path)
 
     # default execution data
     runtime = None
@@ -179,7 +185,7 @@ def generate_notebook_outputs(
         pk, ntbk = cache_base.merge_match_into_notebook(ntbk)
     except KeyError:
         message = (
-            f"Couldn't find cache key for notebook file {str(r_file_path)}. "
+            f"Couldn't find cache key for notebook file {r_file_path}. "
             "Outputs will not be inserted."
         )
         try:
@@ -189,7 +195,7 @@ def generate_notebook_outputs(
         if stage_record and stage_record.traceback:
             report_path, suffix = _report_exec_fail(
                 env,
-                r_file_path.name,
+                os.path.basename(r_file_path),
                 stage_record.traceback,
                 show_traceback,
                 "\n  Last execution failed with traceback saved in {}",
@@ -199,7 +205,7 @@ def generate_notebook_outputs(
         LOGGER.error(message)
 
     else:
-        LOGGER.verbose("Merged cached outputs into %s", str(r_file_path))
+        LOGGER.verbose("Merged cached outputs into %s", r_file_path)
         succeeded = True
         try:
             runtime = cache_base.get_cache_record(pk).data.get(
@@ -208,31 +214,229 @@ def generate_notebook_outputs(
         except Exception:
             pass
 
-    env.nb_execution_data_changed = True
-    env.nb_execution_data[env.docname] = {
-        "mtime": datetime.now().timestamp(),
+    _set_execution_data(env, execution_method, runtime, succeeded, report_path)
+
+    return ntbk
+
+
+def _set_execution_data(
+    env: BuildEnvironment,
+    method: str,
+    runtime: Optional[float],
+    succeeded: bool,
+    report_path: Optional[str],
+) -> None:
+    """Record the execution statistics for the current document."""
+    data = {
+        "mtime": time.time(),
         "runtime": runtime,
-        "method": execution_method,
+        "method": method,
         "succeeded": succeeded,
     }
     if report_path:
-        env.nb_execution_data[env.docname]["error_log"] = report_path
+        data["error_log"] = report_path
+    env.nb_execution_data[env.docname] = data
+    env.nb_execution_data_changed = True
+
+
+def _execute_direct(env: BuildEnvironment, ntbk: nbf.NotebookNode, file_path: str):
+    """Execute the notebook (without caching),
+    either in a temporary directory or in the notebook's parent folder.
+    """
+    config = env.config
+    if config["execution_in_temp"]:
+        LOGGER.info("Executing: %s in temporary directory", env.docname)
+    else:
+        LOGGER.info("Executing: %s in: %s", env.docname, Path(file_path).parent)
+    return _execute_nb(
+        ntbk,
+        file_path,
+        config["execution_in_temp"],
+        config["execution_timeout"],
+        config["execution_allow_errors"],
+    )
 
-    return ntbk
+
+class DirectExecutionResult(NamedTuple):
+    """The result of a notebook execution, that can be passed between processes."""
+
+    nb: nbf.NotebookNode
+    time: float
+    err: Optional[str]
+    exc_string: Optional[str]
+
+
+def _execute_nb(
+    ntbk: nbf.NotebookNode,
+    file_path: str,
+    in_temp: bool,
+    timeout: Optional[int],
+    allow_errors: bool,
+) -> DirectExecutionResult:
+    """Execute a notebook, returning a picklable result.
+
+    This is a module level function, so that it can be run in a process pool.
+    """
+    with ExitStack() as stack:
+        if in_temp:
+            cwd = stack.enter_context(tempfile.TemporaryDirectory())
+        else:
+            cwd = Path(file_path).parent
+        result = single_nb_execution(
+            ntbk, cwd=cwd, timeout=timeout, allow_errors=allow_errors
+        )
+    # the execution error may not be picklable, so only its repr is returned
+    return DirectExecutionResult(
+        result.nb,
+        result.time,
+        None if result.err is None else repr(result.err),
+        result.exc_string,
+    )
+
+
+def _execute_parallel(env: BuildEnvironment, exec_docnames: List[str], workers: int):
+    """Execute the outdated notebooks across a pool of processes,
+    storing the results for retrieval by ``generate_notebook_outputs``.
+
+    Notebooks that cannot be converted or executed here
+    are left to be executed serially, when they are read.
+    """
+    config = env.config
+    futures = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for docname in exec_docnames:
+            source_path = env.doc2path(docname)
+            try:
+                with open(source_path, encoding="utf8") as handle:
+                    text = handle.read()
+                converter = get_nb_converter(source_path, env, StringIO(text))
+                if converter is None:
+                    continue
+                ntbk = converter.func(text)
+            except Exception:
+                # any errors will be reported when the notebook is read
+                continue
+            if config["jupyter_execute_notebooks"] == "auto" and nb_has_all_output(
+                source_path, ntbk=ntbk
+            ):
+                continue
+            LOGGER.info("Executing: %s in process pool", docname)
+            futures[docname] = pool.submit(
+                _execute_nb,
+                ntbk,
+                source_path,
+                config["execution_in_temp"],
+                config["execution_timeout"],
+                config["execution_allow_errors"],
+            )
+        with progress_message("executing outdated notebooks"):
+            for docname, future in futures.items():
+                try:
+                    env.nb_executed_parallel[docname] = future.result()
+                except Exception as err:
+                    LOGGER.warning(
+                        "Parallel execution of %s failed, "
+                        "it will be executed when read: %s",
+                        docname,
+                        err,
+                    )
+
+
+def _glob_part_to_regex(part: str) -> str:
+    """Translate a single path component of a glob pattern to a regex,
+    as matched by ``fnmatch``, except that wildcards never match ``/``.
+    """
+    i, length, regex = 0, len(part), []
+    while i < length:
+        char = part[i]
+        i += 1
+        if char == "*":
+            regex.append("[^/]*")
+        elif char == "?":
+            regex.append("[^/]")
+        elif char == "[":
+            end = i
+            if end < length and part[end] == "!":
+                end += 1
+            if end < length and part[end] == "]":
+                end += 1
+            while end < length and part[end] != "]":
+                end += 1
+            if end >= length:
+                regex.append("\\[")
+                continue
+            chars = part[i:end].replace("\\", "\\\\")
+            i = end + 1
+            if chars.startswith("!"):
+                chars = "^" + chars[1:] + "/"
+            elif chars.startswith("^"):
+                chars = "\\" + chars
+            regex.append("[" + chars + "]")
+        else:
+            regex.append(re.escape(char))
+    return "".join(regex)
+
+
+def _glob_to_regex(pattern: str) -> Optional[str]:
+    """Translate a glob pattern to a regex, matching the posix paths
+    (relative to the root folder) of the files found by ``root.rglob(pattern)``.
+
+    Returns ``None`` if the pattern can only match directories.
+    """
+    parts = pattern.replace(os.sep, "/").split("/")
+    parts = [part for part in parts if part not in ("", ".")]
+    if not parts or parts[-1] == "**":
+        return None
+    # rglob prefixes the pattern with ``**``, i.e. zero or more directories
+    regex = ["(?:.*/)?"]
+    for part in parts[:-1]:
+        regex.append("(?:.*/)?" if part == "**" else _glob_part_to_regex(part) + "/")
+    regex.append(_glob_part_to_regex(parts[-1]))
+    return "".join(regex)
+
+
+def compile_exclude_patterns(patterns: Iterable[str]) -> Optional[Pattern]:
+    """Compile the ``execution_excludepatterns`` into a single regex.
+
+    A posix path, relative to the root folder, fully matches the regex
+    if the file would be found by ``Path(root).rglob(pattern)`` for any pattern.
+    """
+    regexes = [_glob_to_regex(pattern) for pattern in patterns]
+    regexes = [regex for regex in regexes if regex is not None]
+    if not regexes:
+        return None
+    # pathlib matches case-insensitively on Windows
+    flags = re.IGNORECASE if os.name == "nt" else 0
+    return re.compile("(?:" + "|".join(regexes) + ")", flags)
+
+
+def is_excluded_exec_path(
+    exclude_regex: Optional[Pattern], root: str, doc_path: str
+) -> bool:
+    """Check if a path is excluded from execution,
+    by patterns compiled with ``compile_exclude_patterns``.
+    """
+    if exclude_regex is None:
+        return False
+    try:
+        rel_path = os.path.relpath(doc_path, root)
+    except ValueError:
+        # on Windows, the path may be on a different drive to the root
+        return False
+    if rel_path == os.pardir or rel_path.startswith(os.pardir + os.sep):
+        # paths outside the root folder are not globbed
+        return False
+    return exclude_regex.fullmatch(rel_path.replace(os.sep, "/")) is not None
 
 
 def is_valid_exec_file(env: BuildEnvironment, docname: str) -> bool:
     """Check if the docname refers to a file that should be executed."""
     doc_path = env.doc2path(docname)
-    if doc_path in env.nb_excluded_exec_paths:
-        return False
-    matches = tuple(
-        re.search(re.escape(suffix) + "$", doc_path)
-        for suffix in env.nb_allowed_exec_suffixes
-    )
-    if not any(matches):
+    if is_excluded_exec_path(
+        env.nb_excluded_exec_regex, env.nb_excluded_exec_root, doc_path
+    ):
         return False
-    return True
+    return doc_path.endswith(tuple(env.nb_allowed_exec_suffixes))
 
 
 def _report_exec_fail(
@@ -253,6 +457,11 @@ def _report_exec_fail(
     return str(full_path), message
 
 
+def _get_staged_pks(cache_base) -> Dict[str, int]:
+    """Return a mapping of staged notebook URIs to their primary keys."""
+    return {record.uri: record.pk for record in cache_base.list_staged_records()}
+
+
 def _stage_and_execute(
     env: BuildEnvironment,
     exec_docnames: List[str],
@@ -262,7 +471,8 @@ def _stage_and_execute(
     exec_in_temp: bool,
 ):
     pk_list = []
-    cache_base = get_cache(path_to_cache)
+    cache_base = _get_cache(path_to_cache)
+    staged = _get_staged_pks(cache_base) if exec_docnames else {}
 
     for nb in exec_docnames:
         source_path = env.doc2path(nb)
@@ -270,8 +480,11 @@ def _stage_and_execute(
             # here we pass an iterator, so that only the required lines are read
             converter = get_nb_converter(source_path, env, (line for line in handle))
         if converter is not None:
-            stage_record = cache_base.stage_notebook_file(source_path)
-            pk_list.append(stage_record.pk)
+            # only write to the cache database for notebooks not already staged
+            pk = staged.get(str(Path(source_path).absolute()))
+            if pk is None:
+                pk = cache_base.stage_notebook_file(source_path).pk
+            pk_list.append(pk)
 
     # can leverage parallel execution implemented in jupyter-cache here
     try:
@@ -328,18 +541,25 @@ def execute_staged_nb(
 
 
 def nb_has_all_output(
-    source_path: str, nb_extensions: Iterable[str] = (".ipynb",)
+    source_path: str,
+    nb_extensions: Iterable[str] = (".ipynb",),
+    ntbk: Optional[nbf.NotebookNode] = None,
 ) -> bool:
-    """Determine if the path contains a notebook with at least one output."""
-    has_outputs = False
+    """Determine if the path contains a notebook with at least one output.
+
+    :param ntbk: the notebook already read from ``source_path``, if available,
+        to avoid reading it from disk again
+    """
     ext = os.path.splitext(source_path)[1]
+    if ext not in nb_extensions:
+        return False
 
-    if ext in nb_extensions:
+    if ntbk is None:
         with open(source_path, "r", encoding="utf8") as f:
             ntbk = nbf.read(f, as_version=4)
-            has_outputs = all(
-                len(cell.outputs) != 0
-                for cell in ntbk.cells
-                if cell["cell_type"] == "code"
-            )
-    return has_outputs
+    for cell in ntbk.cells:
+        if cell["cell_type"] != "code":
+            continue
+        if not cell.outputs:
+            return False
+    return True
@@ -1,7 +1,8 @@
 import copy
 import json
+from collections.abc import Mapping
 from pathlib import Path
-from typing import Dict, List, cast
+from typing import Container, Dict, Iterator, List, Set, cast
 
 from docutils import nodes
 from docutils.parsers.rst import directives
@@ -248,6 +249,36 @@ def paste_text_role(name, rawtext, text, lineno, inliner, options=None, content=
     return [PasteTextNode(key, formatting=formatting, location=(path, lineno))], []
 
 
+class _KeyToDocname(Mapping):
+    """A read-only view of a docmap, as a mapping of keys to docnames.
+
+    Lookups are computed on demand, so notebooks without glue outputs
+    do not pay for inverting the mapping of all keys across all documents.
+    Membership tests, the common case, go through the ``keys`` collection,
+    and only reporting a clash scans the docmap.
+    """
+
+    def __init__(self, docmap: Dict[str, Set[str]], keys: Container[str]):
+        self._docmap = docmap
+        self._keys = keys
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys
+
+    def __getitem__(self, key: str) -> str:
+        for docname, keys in self._docmap.items():
+            if key in keys:
+                return docname
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for keys in self._docmap.values():
+            yield from keys
+
+    def __len__(self) -> int:
+        return sum(len(keys) for keys in self._docmap.values())
+
+
 class NbGlueDomain(Domain):
     """A sphinx domain for handling glue data """
 
@@ -275,11 +306,17 @@ class NbGlueDomain(Domain):
     def __contains__(self, key):
         return key in self.cache
 
-    def get(self, key, view=True, replace=True):
-        """Grab the output for this key and replace `glue` specific prefix info."""
+    def get(self, key, view=True, replace=True, shallow=False):
+        """Grab the output for this key and replace `glue` specific prefix info.
+
+        :param view: return a copy of the output, rather than the cached object
+        :param replace: strip the glue mime prefix from the output data keys
+        :param shallow: if ``view``, only make a shallow copy of the output,
+            for read-only consumers (nested values are shared with the cache)
+        """
         output = self.cache.get(key)
         if view:
-            output = copy.deepcopy(output)
+            output = copy.copy(output) if shallow else copy.deepcopy(output)
         if replace:
             output["data"] = {
                 key.replace(GLUE_PREFIX, ""): val for key, val in output["data"].items()
@@ -311,10 +348,14 @@ class NbGlueDomain(Domain):
         """Find all glue keys from the notebook and add to the cache."""
         new_keys = find_all_keys(
             ntbk,
-            existing_keys={v: k for k, vs in self.docmap.items() for v in vs},
+            existing_keys=_KeyToDocname(self.docmap, self.cache),
             path=str(docname),
             logger=SPHINX_LOGGER,
         )
+        if not new_keys:
+            # don't store (and pickle) empty entries for notebooks without glue
+            self.docmap.pop(str(docname), None)
+            return
         self.docmap[str(docname)] = set(new_keys)
         self.cache.update(new_keys)
 
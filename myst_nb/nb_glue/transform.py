@@ -26,7 +26,8 @@ class PasteNodesToDocutils(SphinxTransform):
                 continue
 
             # Grab the output for this key
-            output = glue_domain.get(paste_node.key)
+            # (the output is only read, so a shallow copy is sufficient)
+            output = glue_domain.get(paste_node.key, shallow=True)
 
             out_node = paste_node.create_node(
                 output=output, document=self.document, env=self.app.env
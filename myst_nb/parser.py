@@ -1,3 +1,5 @@
+from array import array
+from io import StringIO
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
@@ -23,6 +25,10 @@ from myst_nb.nodes import CellInputNode, CellNode, CellOutputBundleNode, CellOut
 
 SPHINX_LOGGER = logging.getLogger(__name__)
 
+_REMOVE_CELL_TAGS = frozenset(("remove_cell", "remove-cell"))
+_REMOVE_INPUT_TAGS = frozenset(("remove_input", "remove-input"))
+_REMOVE_OUTPUT_TAGS = frozenset(("remove_output", "remove-output"))
+
 
 class NotebookParser(MystParser):
     """Docutils parser for Markedly Structured Text (MyST) and Jupyter Notebooks."""
@@ -40,10 +46,11 @@ class NotebookParser(MystParser):
         self.reporter = document.reporter
         self.env = document.settings.env  # type: BuildEnvironment
 
+        # here we pass an iterator, so that only the required lines are split
         converter = get_nb_converter(
             self.env.doc2path(self.env.docname, True),
             self.env,
-            inputstring.splitlines(keepends=True),
+            StringIO(inputstring),
         )
 
         if converter is None:
@@ -107,13 +114,16 @@ def nb_to_tokens(
     # like reference definitions will be stored
     env: Dict[str, Any] = {}
     rules = md.core.ruler.get_active_rules()
+    inline_index = rules.index("inline")
+    block_rules = rules[:inline_index]
+    inline_rules = rules[inline_index:]
 
     # First only run pre-inline chains
     # so we can collect all reference definitions, etc, before assessing references
     def parse_block(src, start_line):
         with md.reset_rules():
             # enable only rules up to block
-            md.core.ruler.enableOnly(rules[: rules.index("inline")])
+            md.core.ruler.enableOnly(block_rules)
             tokens = md.parse(src, env)
         for token in tokens:
             if token.map:
@@ -127,8 +137,22 @@ def nb_to_tokens(
                 dup_ref["fixed"] = True
         return tokens
 
-    block_tokens = []
+    block_tokens: List[Token] = []
+    # bind these once, since they are called for every cell
+    add_token = block_tokens.append
+    add_tokens = block_tokens.extend
+
+    # if the the source_map has been stored (for text-based notebooks),
+    # we use that do define the starting line for each cell
+    # otherwise, we set a pseudo base that represents the cell index
+    # (note we use base 1 rather than 0)
     source_map = ntbk.metadata.get("source_map", None)
+    if source_map:
+        start_lines = array("l", (line + 1 for line in source_map))
+    else:
+        start_lines = array(
+            "l", ((index + 1) * 10000 + 1 for index in range(len(ntbk.cells)))
+        )
 
     # get language lexer name
     langinfo = ntbk.metadata.get("language_info", {})
@@ -139,31 +163,27 @@ def nb_to_tokens(
 
     for cell_index, nb_cell in enumerate(ntbk.cells):
 
-        # if the the source_map has been stored (for text-based notebooks),
-        # we use that do define the starting line for each cell
-        # otherwise, we set a pseudo base that represents the cell index
-        start_line = source_map[cell_index] if source_map else (cell_index + 1) * 10000
-        start_line += 1  # use base 1 rather than 0
+        start_line = start_lines[cell_index]
 
         # Skip empty cells
-        if len(nb_cell["source"].strip()) == 0:
+        source = nb_cell["source"]
+        if not source or source.isspace():
             continue
 
         # skip cells tagged for removal
         # TODO this logic should be deferred to a transform
-        tags = nb_cell.metadata.get("tags", [])
-        if ("remove_cell" in tags) or ("remove-cell" in tags):
+        if not _REMOVE_CELL_TAGS.isdisjoint(nb_cell.metadata.get("tags") or ()):
             continue
 
         if nb_cell["cell_type"] == "markdown":
 
             # we add the cell index to tokens,
             # so they can be included in the error logging,
-            block_tokens.extend(parse_block(nb_cell["source"], start_line))
+            add_tokens(parse_block(source, start_line))
 
         elif nb_cell["cell_type"] == "code":
             # here we do nothing but store the cell as a custom token
-            block_tokens.append(
+            add_token(
                 Token(
                     "nb_code_cell",
                     "",
@@ -179,7 +199,7 @@ def nb_to_tokens(
     # only acting on the existing tokens
     state = StateCore("", md, env, block_tokens)
     with md.reset_rules():
-        md.core.ruler.enableOnly(rules[rules.index("inline") :])
+        md.core.ruler.enableOnly(inline_rules)
         md.core.process(state)
 
     # Add the front matter.
@@ -238,12 +258,10 @@ class SphinxNBRenderer(SphinxRenderer):
         tags = cell.metadata.get("tags", [])
 
         # Cell container will wrap whatever is in the cell
-        classes = ["cell"]
-        for tag in tags:
-            classes.append(f"tag_{tag}")
+        classes = ["cell"] + [f"tag_{tag}" for tag in tags]
         sphinx_cell = CellNode(classes=classes, cell_type=cell["cell_type"])
         self.current_node += sphinx_cell
-        if ("remove_input" not in tags) and ("remove-input" not in tags):
+        if _REMOVE_INPUT_TAGS.isdisjoint(tags):
             cell_input = CellInputNode(classes=["cell_input"])
             self.add_line_and_source_path(cell_input, token)
             sphinx_cell += cell_input
@@ -257,11 +275,7 @@ class SphinxNBRenderer(SphinxRenderer):
         # ==================
         # Cell output
         # ==================
-        if (
-            ("remove_output" not in tags)
-            and ("remove-output" not in tags)
-            and cell["outputs"]
-        ):
+        if _REMOVE_OUTPUT_TAGS.isdisjoint(tags) and cell["outputs"]:
             cell_output = CellOutputNode(classes=["cell_output"])
             sphinx_cell += cell_output
 
@@ -280,19 +294,20 @@ def nb_output_to_disc(ntbk: nbf.NotebookNode, document: nodes.document) -> Path:
     """
     replace_mime = []
     for cell in ntbk.cells:
-        if hasattr(cell, "outputs"):
-            for out in cell.outputs:
-                if "data" in out:
-                    # Only do the mimebundle replacing for the scrapbook outputs
-                    mime_prefix = (
-                        out.get("metadata", {}).get("scrapbook", {}).get("mime_prefix")
-                    )
-                    if mime_prefix:
-                        out["data"] = {
-                            key.replace(mime_prefix, ""): val
-                            for key, val in out["data"].items()
-                        }
-                        replace_mime.append(out)
+        if cell.cell_type != "code":
+            continue
+        for out in cell.outputs:
+            if "data" not in out:
+                continue
+            # Only do the mimebundle replacing for the scrapbook outputs
+            scrapbook = out.get("metadata", {}).get("scrapbook")
+            mime_prefix = scrapbook.get("mime_prefix") if scrapbook else None
+            if mime_prefix:
+                out["data"] = {
+                    key.replace(mime_prefix, ""): val
+                    for key, val in out["data"].items()
+                }
+                replace_mime.append(out)
 
     # Write the notebook's output to disk. This changes metadata in notebook cells
     path_doc = Path(document.settings.env.docname)
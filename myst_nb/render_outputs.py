@@ -1,4 +1,5 @@
 """A Sphinx post-transform, to convert notebook outpus to AST nodes."""
+import functools
 import os
 from abc import ABC, abstractmethod
 from typing import List, Optional
@@ -7,9 +8,10 @@ from unittest import mock
 import nbconvert
 from docutils import nodes
 from docutils.parsers.rst import directives
-from importlib_metadata import entry_points
+from importlib_metadata import EntryPoint, entry_points
 from jupyter_sphinx.ast import JupyterWidgetViewNode, strip_latex_delimiters
 from jupyter_sphinx.utils import sphinx_abs_dir
+from markdown_it import MarkdownIt
 from myst_parser.docutils_renderer import make_document
 from myst_parser.main import MdParserConfig, default_parser
 from nbformat import NotebookNode
@@ -63,14 +65,23 @@ def get_default_render_priority(builder: str) -> Optional[List[str]]:
     return priority.get(builder, None)
 
 
+@functools.lru_cache(maxsize=1)
+def _get_commonmark_parser() -> MarkdownIt:
+    """Return the parser for markdown outputs and captions.
+
+    This is shared by all renderers, since the renderer state is reset
+    by the ``document`` and ``current_node`` options, before each render.
+    """
+    return default_parser(MdParserConfig(commonmark_only=True))
+
+
 class MystNbEntryPointError(SphinxError):
     category = "MyST NB Renderer Load"
 
 
-def load_renderer(name: str) -> "CellOutputRendererBase":
-    """Load a renderer,
-    given a name within the ``myst_nb.mime_render`` entry point group
-    """
+@functools.lru_cache(maxsize=None)
+def _get_renderer_entry_point(name: str) -> Optional[EntryPoint]:
+    """Find a renderer entry point, scanning the installed distributions only once."""
     all_eps = entry_points()
     if hasattr(all_eps, "select"):
         # importlib_metadata >= 3.6 or importlib.metadata in python >=3.10
@@ -79,8 +90,16 @@ def load_renderer(name: str) -> "CellOutputRendererBase":
     else:
         eps = {ep.name: ep for ep in all_eps.get("myst_nb.mime_render", [])}
         found = name in eps
-    if found:
-        klass = eps[name].load()
+    return eps[name] if found else None
+
+
+def load_renderer(name: str) -> "CellOutputRendererBase":
+    """Load a renderer,
+    given a name within the ``myst_nb.mime_render`` entry point group
+    """
+    entry_point = _get_renderer_entry_point(name)
+    if entry_point is not None:
+        klass = entry_point.load()
         if not issubclass(klass, CellOutputRendererBase):
             raise MystNbEntryPointError(
                 f"Entry Point for myst_nb.mime_render:{name} "
@@ -235,7 +254,7 @@ class CellOutputRendererBase(ABC):
         self, text: str, parent: Optional[nodes.Node] = None
     ) -> List[nodes.Node]:
         """Parse text as CommonMark, in a new document."""
-        parser = default_parser(MdParserConfig(commonmark_only=True))
+        parser = _get_commonmark_parser()
 
         # setup parent node
         if parent is None:
@@ -307,25 +326,25 @@ class CellOutputRenderer(CellOutputRendererBase):
         )
         return []
 
+    # nb_output_stderr values that report stderr outputs -> the method to report with
+    _stderr_reporters = {
+        "remove-warn": "make_warning",
+        "warn": "make_warning",
+        "error": "make_error",
+        "severe": "make_severe",
+    }
+
     def render_stderr(self, output: NotebookNode, index: int):
         """Output a container with an unhighlighted literal block."""
         text = output["text"]
+        output_stderr = self.env.config.nb_output_stderr
 
-        if self.env.config.nb_output_stderr == "show":
-            pass
-        elif self.env.config.nb_output_stderr == "remove-warn":
-            self.make_warning(f"stderr was found in the cell outputs: {text}")
-            return []
-        elif self.env.config.nb_output_stderr == "warn":
-            self.make_warning(f"stderr was found in the cell outputs: {text}")
-        elif self.env.config.nb_output_stderr == "error":
-            self.make_error(f"stderr was found in the cell outputs: {text}")
-        elif self.env.config.nb_output_stderr == "severe":
-            self.make_severe(f"stderr was found in the cell outputs: {text}")
-
-        if (
+        reporter = self._stderr_reporters.get(output_stderr)
+        if reporter is not None:
+            getattr(self, reporter)(f"stderr was found in the cell outputs: {text}")
+
+        if output_stderr in ("remove", "remove-warn") or (
             "remove-stderr" in self.node.metadata.get("tags", [])
-            or self.env.config.nb_output_stderr == "remove"
         ):
             return []
 
@@ -429,18 +448,10 @@ class CellOutputRenderer(CellOutputRendererBase):
             # it becomes clickable?! (i.e. will open the image in the browser)
             image_node = nodes.image(uri=uri)
 
-            myst_meta_img = self.node.metadata.get(
-                self.env.config.nb_render_key, {}
-            ).get("image", {})
-
-            for key, spec in [
-                ("classes", directives.class_option),
-                ("alt", directives.unchanged),
-                ("height", directives.length_or_unitless),
-                ("width", directives.length_or_percentage_or_unitless),
-                ("scale", directives.percentage),
-                ("align", align),
-            ]:
+            myst_meta = self.node.metadata.get(self.env.config.nb_render_key, {})
+            myst_meta_img = myst_meta.get("image", {})
+
+            for key, spec in _IMAGE_OPTION_SPECS:
                 if key in myst_meta_img:
                     value = myst_meta_img[key]
                     try:
@@ -452,9 +463,7 @@ class CellOutputRenderer(CellOutputRendererBase):
                         )
                         return [self.make_error(error_msg)]
 
-            myst_meta_fig = self.node.metadata.get(
-                self.env.config.nb_render_key, {}
-            ).get("figure", {})
+            myst_meta_fig = myst_meta.get("figure", {})
             if "caption" not in myst_meta_fig:
                 return [image_node]
 
@@ -488,6 +497,17 @@ def align(argument):
     return directives.choice(argument, ("left", "center", "right"))
 
 
+# the image options which can be set in the cell metadata, and their validators
+_IMAGE_OPTION_SPECS = (
+    ("classes", directives.class_option),
+    ("alt", directives.unchanged),
+    ("height", directives.length_or_unitless),
+    ("width", directives.length_or_percentage_or_unitless),
+    ("scale", directives.percentage),
+    ("align", align),
+)
+
+
 class CellOutputRendererInline(CellOutputRenderer):
     """Replaces literal/math blocks with non-block versions"""
 
@@ -1,7 +1,10 @@
 import os
+from pathlib import Path
 
 import pytest
 
+from myst_nb.execution import compile_exclude_patterns, is_excluded_exec_path
+
 
 def regress_nb_doc(file_regression, sphinx_run, check_nbs):
     file_regression.check(
@@ -49,6 +52,20 @@ def test_basic_unrun_cache(sphinx_run, file_regression, check_nbs):
     assert sphinx_run.env.nb_execution_data["basic_unrun"]["succeeded"] is True
 
 
+@pytest.mark.sphinx_params(
+    "basic_unrun.ipynb",
+    "basic_run.ipynb",
+    conf={"jupyter_execute_notebooks": "force", "execution_workers": 2},
+)
+def test_parallel_force(sphinx_run):
+    """The notebooks should be executed in a process pool."""
+    sphinx_run.build()
+    assert "in process pool" in sphinx_run.status(), sphinx_run.status()
+    for docname in ("basic_unrun", "basic_run"):
+        assert sphinx_run.env.nb_execution_data[docname]["succeeded"] is True
+    assert sphinx_run.env.nb_executed_parallel == {}
+
+
 @pytest.mark.sphinx_params(
     "basic_unrun.ipynb", conf={"jupyter_execute_notebooks": "cache"}
 )
@@ -83,13 +100,74 @@ def test_rebuild_force(sphinx_run):
 def test_exclude_path(sphinx_run, file_regression):
     """The notebook should not be executed."""
     sphinx_run.build()
-    assert len(sphinx_run.app.env.nb_excluded_exec_paths) == 1
+    env = sphinx_run.app.env
+    assert is_excluded_exec_path(
+        env.nb_excluded_exec_regex,
+        env.nb_excluded_exec_root,
+        env.doc2path("basic_unrun"),
+    )
     assert "Executing" not in sphinx_run.status(), sphinx_run.status()
     file_regression.check(
         sphinx_run.get_doctree().pformat(), extension=".xml", encoding="utf8"
     )
 
 
+EXCLUDE_TREE = (
+    "n.ipynb",
+    "x.ipynb",
+    "basic_unrun.ipynb",
+    "a/n.ipynb",
+    "a/b/n.ipynb",
+    "a/b/b/n.md",
+    "a/b/c/n.md",
+    "b/n.md",
+    "proj/n.ipynb",
+    "sub/x.ipynb",
+    "sub/y.ipynb",
+    "[x].md",
+)
+
+
+@pytest.mark.parametrize(
+    "patterns",
+    [
+        ["basic_*"],
+        ["*.ipynb"],
+        ["n.ipynb"],
+        ["?.ipynb"],
+        ["a/**/n.ipynb"],
+        ["a/b/**/n.md"],
+        ["**/b/*.md"],
+        ["*/b/n.ipynb"],
+        ["a/*"],
+        ["a/**"],
+        ["a/b"],
+        ["proj/*"],
+        ["[ab]/n.ipynb"],
+        ["sub/[!x]*.ipynb"],
+        ["[x"],
+        ["./a/n.ipynb"],
+        ["b/*.md", "sub/*"],
+    ],
+)
+def test_exclude_patterns_match_rglob(patterns, tmp_path, monkeypatch):
+    """Excluded paths should be the files found by ``Path.cwd().rglob(pattern)``."""
+    root = tmp_path / "proj"
+    for name in EXCLUDE_TREE:
+        root.joinpath(name).parent.mkdir(parents=True, exist_ok=True)
+        root.joinpath(name).write_text("")
+    monkeypatch.chdir(root)
+    expected = {str(path) for pat in patterns for path in Path.cwd().rglob(pat)}
+    regex = compile_exclude_patterns(patterns)
+    for name in EXCLUDE_TREE:
+        path = str(Path.cwd().joinpath(name))
+        assert is_excluded_exec_path(regex, os.getcwd(), path) is (
+            path in expected
+        ), name
+    # files outside the root folder are never excluded
+    assert not is_excluded_exec_path(regex, str(root / "sub"), str(root / "n.ipynb"))
+
+
 @pytest.mark.sphinx_params(
     "basic_failing.ipynb", conf={"jupyter_execute_notebooks": "cache"}
 )
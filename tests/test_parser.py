@@ -1,5 +1,8 @@
+import nbformat as nbf
 import pytest
 
+from myst_nb.converter import NOTEBOOK_VERSION, get_nb_converter, read_ipynb_unvalidated
+
 
 @pytest.mark.sphinx_params("basic_run.ipynb", conf={"jupyter_execute_notebooks": "off"})
 def test_basic_run(sphinx_run, file_regression):
@@ -88,3 +91,40 @@ def test_toctree_in_ipynb(sphinx_run, file_regression):
         sphinx_run.get_doctree("latex_build/other").pformat(), extension=".xml"
     )
     assert sphinx_run.warnings() == ""
+
+
+@pytest.mark.parametrize("name", ["basic_run.ipynb", "complex_outputs.ipynb"])
+def test_read_ipynb_unvalidated(name, get_test_path):
+    text = get_test_path(name).read_text(encoding="utf8")
+    assert read_ipynb_unvalidated(text) == nbf.reads(text, as_version=NOTEBOOK_VERSION)
+
+
+@pytest.mark.parametrize("text", ["[]", '"notebook"', "1"])
+def test_read_ipynb_unvalidated_not_object(text):
+    with pytest.raises(ValueError, match="Notebook JSON must be an object"):
+        read_ipynb_unvalidated(text)
+
+
+@pytest.mark.parametrize(
+    "validate",
+    [
+        pytest.param(
+            validate,
+            marks=pytest.mark.sphinx_params(
+                "basic_run.ipynb",
+                conf={
+                    "jupyter_execute_notebooks": "off",
+                    "nb_validate_notebooks": validate,
+                },
+            ),
+        )
+        for validate in (True, False)
+    ],
+)
+def test_basic_run_validate(validate, sphinx_run):
+    env = sphinx_run.app.env
+    converter = get_nb_converter(env.doc2path("basic_run"), env)
+    assert (converter.func is read_ipynb_unvalidated) is not validate
+    sphinx_run.build()
+    assert sphinx_run.warnings() == ""
+    assert env.metadata["basic_run"]["test_name"] == "notebook1"